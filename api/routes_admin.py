@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Query, Response
+from typing import Optional, Literal
+from services.profiling_service import (
+    profiling_status,
+    configure_profiling,
+    stop_profiling,
+    reset_profiling,
+    export_profile
+)
+from services.replica_service import refresh_replica_admin
+
+
+router = APIRouter()
+
+
+@router.get("/profiling")
+def profiling_status_route(admin_user_id: int = Query(..., description="User id (must be admin)")):
+    return profiling_status(admin_user_id)
+
+
+@router.post("/profiling")
+def configure_profiling_route(
+    admin_user_id: int = Query(..., description="User id (must be admin)"),
+    mode: Optional[Literal["cprofile", "sampling"]] = None,
+    sample_rate: Optional[float] = Query(None, ge=0, le=1),
+    route: Optional[str] = Query(None, description="Route path, e.g. /availability"),
+    count: Optional[int] = Query(None, ge=0, description="Profile the next N requests to route"),
+    interval_ms: Optional[float] = Query(None, gt=0, description="Sampling interval; each sampled request also gets one sample at entry")
+):
+    return configure_profiling(admin_user_id, mode, sample_rate, route, count, interval_ms)
+
+
+@router.post("/profiling/stop")
+def stop_profiling_route(admin_user_id: int = Query(..., description="User id (must be admin)")):
+    return stop_profiling(admin_user_id)
+
+
+@router.post("/profiling/reset")
+def reset_profiling_route(admin_user_id: int = Query(..., description="User id (must be admin)")):
+    return reset_profiling(admin_user_id)
+
+
+@router.get("/profiling/export")
+def export_profile_route(
+    admin_user_id: int = Query(..., description="User id (must be admin)"),
+    format: Literal["pstats", "collapsed"] = "pstats"
+):
+    data = export_profile(admin_user_id, format)
+    if format == "pstats":
+        return Response(
+            content=data,
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": 'attachment; filename="profile.pstats"'}
+        )
+    return Response(content=data, media_type="text/plain")
+
+
+@router.post("/replica/refresh")
+def refresh_replica_route(admin_user_id: int = Query(..., description="User id (must be admin)")):
+    return refresh_replica_admin(admin_user_id)
@@ -8,9 +8,10 @@ from services.reservations_service import (
     availability,
     occupancy_report
 )
+from profiling import ProfiledRoute
 
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.post("/reservations", response_model=ReservationOut)
@@ -29,10 +30,10 @@ def my_reservations_route(user_id: int, include_cancelled: bool = False):
 
 
 @router.get("/availability")
-def availability_route(start_date: str, end_date: str, min_capacity: Optional[int] = None):
-    return availability(start_date, end_date, min_capacity)
+async def availability_route(start_date: str, end_date: str, min_capacity: Optional[int] = None):
+    return await availability(start_date, end_date, min_capacity)
 
 
 @router.get("/reports/occupancy")
-def occupancy_report_route(day: str = Query(..., description="YYYY-MM-DD")):
-    return occupancy_report(day)
+async def occupancy_report_route(day: str = Query(..., description="YYYY-MM-DD")):
+    return await occupancy_report(day)
@@ -2,9 +2,10 @@ from fastapi import APIRouter, Query
 from typing import Optional, List
 from models import ResourceCreate, ResourceOut
 from services.resources_service import create_resource_admin, list_resources
+from profiling import ProfiledRoute
 
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.post("", response_model=ResourceOut)
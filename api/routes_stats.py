@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from db import replica_stats
+from services.heavy_reads import heavy_read_stats
+from profiling import ProfiledRoute
+
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.get("/heavy-reads")
+def heavy_reads_stats_route():
+    return heavy_read_stats()
+
+
+@router.get("/replica")
+def replica_stats_route():
+    return replica_stats()
@@ -2,9 +2,10 @@ from typing import List
 from fastapi import APIRouter
 from models import UserCreate, UserOut
 from services.users_service import create_user, get_user_all, get_user_by_username
+from profiling import ProfiledRoute
 
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.post("", response_model=UserOut)
@@ -0,0 +1,53 @@
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import db
+from models import ReservationCreate, ResourceCreate, UserCreate
+from services.users_service import create_user
+from services.resources_service import create_resource_admin
+from services.reservations_service import create_reservation, cancel_reservation
+
+
+def setup(rooms: int):
+    db.init_db()
+    create_user(UserCreate(username="bench-admin", is_admin=True))
+    for i in range(rooms):
+        create_resource_admin(ResourceCreate(name=f"Room {i}", capacity=10), admin_user_id=1)
+
+
+def worker(room_id: int, ops: int):
+    for i in range(ops):
+        day = f"2030-01-{i % 28 + 1:02d}"
+        r = create_reservation(ReservationCreate(
+            user_id=1, resource_id=room_id, start_date=day, end_date=day
+        ))
+        cancel_reservation(r["id"], actor_user_id=1)
+
+
+def run(group_commit: bool, threads: int, ops: int) -> float:
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "bench.db"
+    setup(threads)
+    if group_commit:
+        db.start_group_commit()
+    try:
+        ts = [threading.Thread(target=worker, args=(i + 1, ops)) for i in range(threads)]
+        start = time.perf_counter()
+        for t in ts:
+            t.start()
+        for t in ts:
+            t.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        db.stop_group_commit()
+    return threads * ops * 2 / elapsed
+
+
+if __name__ == "__main__":
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    ops = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    for mode in (False, True):
+        label = "group commit" if mode else "per-request commit"
+        print(f"{label:>20}: {run(mode, threads, ops):8.1f} writes/s  ({threads} threads x {ops} create+cancel)")
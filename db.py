@@ -1,10 +1,28 @@
+import os
+import queue
+import shutil
 import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
 from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
 
 
 DB_PATH = Path(__file__).with_name("reservations.db")
 
+GROUP_COMMIT = os.getenv("GROUP_COMMIT", "0") == "1"
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("GROUP_COMMIT_MAX_BATCH", "64"))
+GROUP_COMMIT_WINDOW_MS = float(os.getenv("GROUP_COMMIT_WINDOW_MS", "2"))
+
+REPLICA = os.getenv("REPLICA", "0") == "1"
+REPLICA_REFRESH_SECONDS = float(os.getenv("REPLICA_REFRESH_SECONDS", "30"))
+REPLICA_MAX_STALENESS_SECONDS = float(os.getenv("REPLICA_MAX_STALENESS_SECONDS", "60"))
+
+db_counters: ContextVar = ContextVar("db_counters", default=None)
+
 
 def get_conn() -> sqlite3.Connection:
     conn = sqlite3.connect(DB_PATH, check_same_thread=False)
@@ -13,9 +31,27 @@ def get_conn() -> sqlite3.Connection:
     return conn
 
 
+def _count_activity(conn: sqlite3.Connection, counters: dict):
+    counters["db_sessions"] += 1
+
+    def trace(sql):
+        if not sql.lstrip().upper().startswith(("BEGIN", "COMMIT", "ROLLBACK", "PRAGMA")):
+            counters["queries"] += 1
+
+    def row_factory(cursor, row):
+        counters["rows"] += 1
+        return sqlite3.Row(cursor, row)
+
+    conn.set_trace_callback(trace)
+    conn.row_factory = row_factory
+
+
 @contextmanager
 def db_session():
     conn = get_conn()
+    counters = db_counters.get()
+    if counters is not None:
+        _count_activity(conn, counters)
     try:
         yield conn
         conn.commit()
@@ -26,6 +62,296 @@ def db_session():
         conn.close()
 
 
+class WriterClosed(RuntimeError):
+    pass
+
+
+class WriteCoordinator:
+    def __init__(self, max_batch: int, window_ms: float):
+        self.max_batch = max_batch
+        self.window = window_ms / 1000
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, op):
+        fut = Future()
+        with self._lock:
+            if self._closed:
+                raise WriterClosed("database writer is not running")
+            self._queue.put((op, fut))
+        return fut.result()
+
+    def close(self):
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        conn = None
+        try:
+            conn = get_conn()
+            conn.isolation_level = None
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+                batch = [item]
+                deadline = time.monotonic() + self.window
+                stop = False
+                while len(batch) < self.max_batch:
+                    try:
+                        item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stop = True
+                        break
+                    batch.append(item)
+                self._apply(conn, batch)
+                if stop:
+                    return
+        finally:
+            # Whatever ends the loop, stop accepting work and fail anything
+            # still queued so no caller waits forever.
+            with self._lock:
+                self._closed = True
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    item[1].set_exception(WriterClosed("database writer stopped"))
+            if conn is not None:
+                conn.close()
+
+    def _apply(self, conn, batch):
+        # One transaction for the whole batch; each op gets its own savepoint so
+        # a failing op is undone without affecting the others.
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for op, _ in batch:
+                conn.execute("SAVEPOINT op")
+                try:
+                    results.append((op(conn), None))
+                    conn.execute("RELEASE op")
+                except Exception as e:
+                    conn.execute("ROLLBACK TO op")
+                    conn.execute("RELEASE op")
+                    results.append((None, e))
+            conn.execute("COMMIT")
+        except Exception as e:
+            for _, fut in batch:
+                fut.set_exception(e)
+            # If the rollback fails too, the connection is unusable; the error
+            # stops the writer and later writes take the per-request path.
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            return
+
+        for (_, fut), (result, error) in zip(batch, results):
+            if error is not None:
+                fut.set_exception(error)
+            else:
+                fut.set_result(result)
+
+
+_writer = None
+
+
+def start_group_commit():
+    global _writer
+    if _writer is None:
+        _writer = WriteCoordinator(GROUP_COMMIT_MAX_BATCH, GROUP_COMMIT_WINDOW_MS)
+
+
+def stop_group_commit():
+    global _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None
+
+
+def run_write(op):
+    writer = _writer
+    if writer is not None:
+        try:
+            return writer.submit(op)
+        except WriterClosed:
+            # Rejected before it was queued, so the op has not run.
+            pass
+    with db_session() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        return op(conn)
+
+
+class SnapshotReplica:
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self.path = None
+        self.generation = 0
+        self.taken_at = None
+        self.refreshes = 0
+        self.last_refresh_seconds = None
+        self.last_error = None
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self._readers = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        # Snapshots live in a directory owned by this process, so several
+        # workers sharing the database never touch each other's files.
+        self._dir = Path(tempfile.mkdtemp(prefix=DB_PATH.stem + "-replica-"))
+        if refresh_seconds > 0:
+            self._thread = threading.Thread(target=self._run, name="db-replica", daemon=True)
+            self._thread.start()
+
+    def refresh(self):
+        with self._refresh_lock:
+            generation = self.generation + 1
+            path = self._dir / f"{generation}.db"
+            started = time.monotonic()
+            src = get_conn()
+            dst = sqlite3.connect(path)
+            try:
+                src.backup(dst)
+            finally:
+                dst.close()
+                src.close()
+
+            # Each refresh writes a new file, so open readers never block it. The
+            # previous generation is deleted once its last reader closes.
+            with self._lock:
+                previous = self.path
+                self.path = path
+                self.generation = generation
+                self._readers[path] = 0
+                self._release(previous)
+            self.taken_at = started
+            self.refreshes += 1
+            self.last_refresh_seconds = time.monotonic() - started
+            self.last_error = None
+
+    def age(self):
+        if self.taken_at is None:
+            return None
+        return time.monotonic() - self.taken_at
+
+    def is_fresh(self, max_staleness: float) -> bool:
+        age = self.age()
+        return age is not None and age <= max_staleness
+
+    @contextmanager
+    def session(self):
+        with self._lock:
+            path = self.path
+            self._readers[path] += 1
+        try:
+            conn = sqlite3.connect(path.as_uri() + "?mode=ro&immutable=1", uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            try:
+                yield conn
+            finally:
+                conn.close()
+        finally:
+            with self._lock:
+                self._readers[path] -= 1
+                if path != self.path:
+                    self._release(path)
+
+    def _release(self, path):
+        if path is None or self._readers.get(path, 0) > 0:
+            return
+        del self._readers[path]
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_seconds):
+            try:
+                self.refresh()
+            except Exception as e:
+                self.last_error = str(e)
+
+
+_replica = None
+
+
+def start_replica():
+    global _replica
+    if _replica is None:
+        replica = SnapshotReplica(REPLICA_REFRESH_SECONDS)
+        replica.refresh()
+        _replica = replica
+
+
+def stop_replica():
+    global _replica
+    if _replica is not None:
+        _replica.close()
+        _replica = None
+
+
+def refresh_replica() -> bool:
+    if _replica is None:
+        return False
+    _replica.refresh()
+    return True
+
+
+def replica_stats():
+    if _replica is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "age_seconds": _replica.age(),
+        "generation": _replica.generation,
+        "max_staleness_seconds": REPLICA_MAX_STALENESS_SECONDS,
+        "refresh_interval_seconds": _replica.refresh_seconds,
+        "refreshes": _replica.refreshes,
+        "last_refresh_seconds": _replica.last_refresh_seconds,
+        "last_error": _replica.last_error,
+        "replica_reads": _replica.replica_reads,
+        "primary_reads": _replica.primary_reads,
+    }
+
+
+@contextmanager
+def read_session(max_staleness: float | None = None):
+    replica = _replica
+    if max_staleness is None:
+        max_staleness = REPLICA_MAX_STALENESS_SECONDS
+    if replica is None or not replica.is_fresh(max_staleness):
+        if replica is not None:
+            replica.primary_reads += 1
+        with db_session() as conn:
+            yield conn
+        return
+
+    replica.replica_reads += 1
+    with replica.session() as conn:
+        counters = db_counters.get()
+        if counters is not None:
+            _count_activity(conn, counters)
+        yield conn
+
+
 def init_db():
     with db_session() as conn:
         conn.executescript(
@@ -1,8 +1,18 @@
 from fastapi import FastAPI
-from db import init_db
+from db import (
+    GROUP_COMMIT,
+    REPLICA,
+    init_db,
+    start_group_commit,
+    stop_group_commit,
+    start_replica,
+    stop_replica
+)
 from api.routes_users import router as users_router
 from api.routes_resources import router as resources_router
 from api.routes_reservations import router as reservations_router
+from api.routes_stats import router as stats_router
+from api.routes_admin import router as admin_router
 
 
 app = FastAPI(title="Room Reservations")
@@ -11,8 +21,20 @@ app = FastAPI(title="Room Reservations")
 @app.on_event("startup")
 def _startup():
     init_db()
+    if GROUP_COMMIT:
+        start_group_commit()
+    if REPLICA:
+        start_replica()
+
+
+@app.on_event("shutdown")
+def _shutdown():
+    stop_replica()
+    stop_group_commit()
 
 
 app.include_router(users_router, prefix="/users", tags=["users"])
 app.include_router(resources_router, prefix="/resources", tags=["resources"])
 app.include_router(reservations_router, prefix="", tags=["reservations"])
+app.include_router(stats_router, prefix="/stats", tags=["stats"])
+app.include_router(admin_router, prefix="/admin", tags=["admin"])
@@ -0,0 +1,244 @@
+import cProfile
+import functools
+import inspect
+import marshal
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from fastapi.routing import APIRoute
+from db import db_counters
+
+
+# Set while an async endpoint is being profiled; run_profiled() applies it to
+# the work that endpoint hands to a worker thread.
+_thread_runner: ContextVar = ContextVar("_thread_runner", default=None)
+
+
+class Profiler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cprofile_slot = threading.Lock()
+        self._sampled_threads = set()
+        self._sampler = None
+        self.active = False
+        self.mode = "cprofile"
+        self.sample_rate = 0.0
+        self.sample_interval = 0.005
+        self.next_requests = {}
+        self.reset()
+
+    def configure(self, mode=None, sample_rate=None, route=None, count=None, interval_ms=None):
+        with self._lock:
+            if mode is not None:
+                self.mode = mode
+            if sample_rate is not None:
+                self.sample_rate = sample_rate
+            if interval_ms is not None:
+                self.sample_interval = interval_ms / 1000
+            if route is not None:
+                if count:
+                    self.next_requests[route] = count
+                else:
+                    self.next_requests.pop(route, None)
+            self.active = self.sample_rate > 0 or bool(self.next_requests)
+
+    def disable(self):
+        with self._lock:
+            self.sample_rate = 0.0
+            self.next_requests.clear()
+            self.active = False
+
+    def reset(self):
+        with self._lock:
+            self._pstats = None
+            self._stacks = Counter()
+            self.routes = {}
+
+    def _should_profile(self, route: str) -> bool:
+        with self._lock:
+            remaining = self.next_requests.get(route)
+            if remaining:
+                if remaining == 1:
+                    del self.next_requests[route]
+                else:
+                    self.next_requests[route] = remaining - 1
+                self.active = self.sample_rate > 0 or bool(self.next_requests)
+                return True
+        return random.random() < self.sample_rate
+
+    def _claim(self, route: str):
+        if self.mode == "sampling":
+            return self._call_sampled if self._should_profile(route) else None
+
+        # cProfile handles one request at a time. Requests that cannot get the
+        # slot run unprofiled and leave the "next N" budget untouched; requests
+        # that are not chosen give the slot back before running.
+        if not self._cprofile_slot.acquire(blocking=False):
+            return None
+        if not self._should_profile(route):
+            self._cprofile_slot.release()
+            return None
+        return self._call_cprofile
+
+    def _unclaim(self, runner):
+        if runner == self._call_cprofile:
+            self._cprofile_slot.release()
+
+    def call(self, route: str, fn, args, kwargs):
+        runner = self._claim(route)
+        if runner is None:
+            return fn(*args, **kwargs)
+        try:
+            counters, token, start = self._start()
+            try:
+                return runner(fn, args, kwargs)
+            finally:
+                self._finish(route, counters, token, start)
+        finally:
+            self._unclaim(runner)
+
+    async def call_async(self, route: str, fn, args, kwargs):
+        runner = self._claim(route)
+        if runner is None:
+            return await fn(*args, **kwargs)
+        runner_token = _thread_runner.set(runner)
+        try:
+            counters, token, start = self._start()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                self._finish(route, counters, token, start)
+        finally:
+            _thread_runner.reset(runner_token)
+            self._unclaim(runner)
+
+    def _start(self):
+        counters = {"db_sessions": 0, "queries": 0, "rows": 0}
+        return counters, db_counters.set(counters), time.perf_counter()
+
+    def _finish(self, route: str, counters: dict, token, start: float):
+        db_counters.reset(token)
+        self._record(route, time.perf_counter() - start, counters)
+
+    def _call_cprofile(self, fn, args, kwargs):
+        prof = cProfile.Profile()
+        try:
+            return prof.runcall(fn, *args, **kwargs)
+        finally:
+            with self._lock:
+                if self._pstats is None:
+                    self._pstats = pstats.Stats(prof)
+                else:
+                    self._pstats.add(prof)
+
+    def _call_sampled(self, fn, args, kwargs):
+        # One sample at entry, so requests shorter than the interval still show up.
+        entry = _stack(sys._getframe()) + [f"{fn.__code__.co_filename}:{fn.__code__.co_name}"]
+        tid = threading.get_ident()
+        with self._lock:
+            self._stacks[";".join(entry)] += 1
+            self._sampled_threads.add(tid)
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+                self._sampler.start()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._sampled_threads.discard(tid)
+
+    def _sample_loop(self):
+        while True:
+            with self._lock:
+                if not self._sampled_threads:
+                    self._sampler = None
+                    return
+                tids = set(self._sampled_threads)
+            frames = sys._current_frames()
+            for tid in tids:
+                stack = _stack(frames.get(tid))
+                if stack:
+                    with self._lock:
+                        self._stacks[";".join(stack)] += 1
+            time.sleep(self.sample_interval)
+
+    def _record(self, route: str, elapsed: float, counters: dict):
+        with self._lock:
+            agg = self.routes.setdefault(
+                route,
+                {"requests": 0, "total_seconds": 0.0, "db_sessions": 0, "queries": 0, "rows": 0}
+            )
+            agg["requests"] += 1
+            agg["total_seconds"] += elapsed
+            for k, v in counters.items():
+                agg[k] += v
+
+    def status(self):
+        with self._lock:
+            return {
+                "active": self.active,
+                "mode": self.mode,
+                "sample_rate": self.sample_rate,
+                "sample_interval_ms": self.sample_interval * 1000,
+                "next_requests": dict(self.next_requests),
+                "routes": {k: dict(v) for k, v in self.routes.items()},
+            }
+
+    def export_pstats(self) -> bytes:
+        with self._lock:
+            return marshal.dumps(self._pstats.stats) if self._pstats is not None else b""
+
+    def export_collapsed(self) -> str:
+        with self._lock:
+            return "".join(f"{stack} {n}\n" for stack, n in self._stacks.items())
+
+
+def _stack(frame):
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_filename}:{code.co_name}")
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+profiler = Profiler()
+
+
+def run_profiled(fn):
+    runner = _thread_runner.get()
+    if runner is None:
+        return fn()
+    return runner(fn, (), {})
+
+
+def profiled(endpoint, route: str):
+    endpoint = getattr(endpoint, "__profiled__", endpoint)
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            if not profiler.active:
+                return await endpoint(*args, **kwargs)
+            return await profiler.call_async(route, endpoint, args, kwargs)
+
+        async_wrapper.__profiled__ = endpoint
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        if not profiler.active:
+            return endpoint(*args, **kwargs)
+        return profiler.call(route, endpoint, args, kwargs)
+
+    wrapper.__profiled__ = endpoint
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, profiled(endpoint, path), **kwargs)
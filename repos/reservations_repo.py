@@ -1,8 +1,11 @@
-from db import db_session
+from db import db_session, read_session, run_write
 
 
-def insert_reservation(user_id: int, resource_id: int, start_date: str, end_date: str):
-    with db_session() as conn:
+def insert_reservation(user_id: int, resource_id: int, start_date: str, end_date: str, *, conflicts):
+    def op(conn):
+        if any(conflicts(r) for r in _select_active_for_resource(conn, resource_id)):
+            return None
+
         cur = conn.execute(
             """
             INSERT INTO reservations(user_id, resource_id, start_date, end_date, status)
@@ -19,6 +22,8 @@ def insert_reservation(user_id: int, resource_id: int, start_date: str, end_date
         ).fetchone()
         return dict(row)
 
+    return run_write(op)
+
 
 def get_reservation_by_id(reservation_id: int):
     with db_session() as conn:
@@ -32,12 +37,15 @@ def get_reservation_by_id(reservation_id: int):
         return dict(row) if row else None
 
 
-def cancel_reservation_by_id(reservation_id: int):
-    with db_session() as conn:
-        conn.execute(
-            "UPDATE reservations SET status = 'CANCELLED' WHERE id = ?",
+def cancel_reservation_by_id(reservation_id: int) -> bool:
+    def op(conn):
+        cur = conn.execute(
+            "UPDATE reservations SET status = 'CANCELLED' WHERE id = ? AND status = 'ACTIVE'",
             (reservation_id,)
         )
+        return cur.rowcount > 0
+
+    return run_write(op)
 
 
 def list_reservations_by_user(user_id: int, include_cancelled: bool):
@@ -56,21 +64,25 @@ def list_reservations_by_user(user_id: int, include_cancelled: bool):
         return [dict(r) for r in rows]
 
 
+def _select_active_for_resource(conn, resource_id: int):
+    rows = conn.execute(
+        """
+        SELECT start_date, end_date
+        FROM reservations
+        WHERE resource_id = ? AND status = 'ACTIVE'
+        """,
+        (resource_id,)
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
 def list_active_reservations_for_resource(resource_id: int):
     with db_session() as conn:
-        rows = conn.execute(
-            """
-            SELECT start_date, end_date
-            FROM reservations
-            WHERE resource_id = ? AND status = 'ACTIVE'
-            """,
-            (resource_id,)
-        ).fetchall()
-        return [dict(r) for r in rows]
+        return _select_active_for_resource(conn, resource_id)
 
 
 def count_reserved_rooms_for_day(day: str) -> int:
-    with db_session() as conn:
+    with read_session() as conn:
         rows = conn.execute(
             """
             SELECT COUNT(DISTINCT resource_id) AS cnt
@@ -85,7 +97,7 @@ def count_reserved_rooms_for_day(day: str) -> int:
 
 
 def count_total_rooms() -> int:
-    with db_session() as conn:
+    with read_session() as conn:
         row = conn.execute(
             "SELECT COUNT(*) AS cnt FROM resources WHERE type='room'"
         ).fetchone()
@@ -1,4 +1,4 @@
-from db import db_session
+from db import db_session, read_session
 
 
 def insert_resource(name: str, type_: str, capacity: int):
@@ -28,7 +28,7 @@ def select_resources(type_=None, min_capacity=None, max_capacity=None):
         params.append(max_capacity)
     q += " ORDER BY capacity DESC, name ASC"
 
-    with db_session() as conn:
+    with read_session() as conn:
         rows = conn.execute(q, params).fetchall()
         return [dict(r) for r in rows]
 
@@ -1,4 +1,4 @@
-from db import db_session
+from db import db_session, read_session
 
 
 def insert_user(username: str, is_admin: bool):
@@ -24,7 +24,7 @@ def find_user_by_username(username: str):
     
 
 def find_user_all():
-    with db_session() as conn:
+    with read_session() as conn:
         row = conn.execute(
             "SELECT id, username, is_admin FROM users",
         ).fetchall()
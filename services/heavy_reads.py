@@ -0,0 +1,103 @@
+import asyncio
+import os
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from profiling import run_profiled
+
+
+# Only running computations hold one of anyio's 40 default worker threads;
+# callers waiting on a shared or queued computation wait on the event loop.
+HEAVY_READ_MAX_THREADS = 16
+HEAVY_READ_CONCURRENCY = min(int(os.getenv("HEAVY_READ_CONCURRENCY", "4")), HEAVY_READ_MAX_THREADS)
+HEAVY_READ_QUEUE_LIMIT = int(os.getenv("HEAVY_READ_QUEUE_LIMIT", "32"))
+
+
+class HeavyReads:
+    def __init__(self, limit: int, queue_limit: int):
+        self.limit = limit
+        self.queue_limit = queue_limit
+        self._calls = {}
+        self._loop = None
+        self._slots = None
+        self.computations = 0
+        self.coalesced = 0
+        self.waiting_requests = 0
+        self.queued = 0
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.rejected = 0
+
+    async def run(self, key, fn):
+        task = self._calls.get(key)
+        if task is None:
+            if len(self._calls) >= self.limit + self.queue_limit:
+                self.rejected += 1
+                raise HTTPException(status_code=503, detail="Server busy, retry later")
+            self.computations += 1
+            task = asyncio.ensure_future(self._compute(fn))
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.coalesced += 1
+
+        # shield() keeps a disconnecting caller from cancelling the computation
+        # the other callers are waiting on.
+        self.waiting_requests += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self.waiting_requests -= 1
+
+    async def _compute(self, fn):
+        slots = self._semaphore()
+        self.queued += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queued)
+        try:
+            await slots.acquire()
+        finally:
+            self.queued -= 1
+
+        self.in_flight += 1
+        try:
+            return await run_in_threadpool(run_profiled, fn)
+        finally:
+            self.in_flight -= 1
+            slots.release()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.limit)
+        return self._slots
+
+    def _done(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()
+
+
+_heavy_reads = HeavyReads(HEAVY_READ_CONCURRENCY, HEAVY_READ_QUEUE_LIMIT)
+
+
+async def run_heavy_read(key, fn):
+    return await _heavy_reads.run(key, fn)
+
+
+def heavy_read_stats():
+    h = _heavy_reads
+    calls = h.computations + h.coalesced
+    return {
+        "calls": calls,
+        "computations": h.computations,
+        "coalesced": h.coalesced,
+        "coalescing_ratio": h.coalesced / calls if calls else 0.0,
+        "concurrency_limit": h.limit,
+        "queue_limit": h.queue_limit,
+        "in_flight": h.in_flight,
+        "queue_depth": h.queued,
+        "max_queue_depth": h.max_queue_depth,
+        "waiting_requests": h.waiting_requests,
+        "rejected": h.rejected,
+    }
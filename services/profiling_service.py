@@ -0,0 +1,37 @@
+from fastapi import HTTPException
+from services.users_service import ensure_admin
+from profiling import profiler
+
+
+def profiling_status(admin_user_id: int):
+    ensure_admin(admin_user_id)
+    return profiler.status()
+
+
+def configure_profiling(admin_user_id: int, mode, sample_rate, route, count, interval_ms):
+    ensure_admin(admin_user_id)
+    if count is not None and route is None:
+        raise HTTPException(status_code=400, detail="count requires route")
+    profiler.configure(
+        mode=mode, sample_rate=sample_rate, route=route, count=count, interval_ms=interval_ms
+    )
+    return profiler.status()
+
+
+def stop_profiling(admin_user_id: int):
+    ensure_admin(admin_user_id)
+    profiler.disable()
+    return profiler.status()
+
+
+def reset_profiling(admin_user_id: int):
+    ensure_admin(admin_user_id)
+    profiler.reset()
+    return profiler.status()
+
+
+def export_profile(admin_user_id: int, format: str):
+    ensure_admin(admin_user_id)
+    if format == "pstats":
+        return profiler.export_pstats()
+    return profiler.export_collapsed()
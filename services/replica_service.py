@@ -0,0 +1,10 @@
+from fastapi import HTTPException
+from db import refresh_replica, replica_stats
+from services.users_service import ensure_admin
+
+
+def refresh_replica_admin(admin_user_id: int):
+    ensure_admin(admin_user_id)
+    if not refresh_replica():
+        raise HTTPException(status_code=409, detail="Replica is not enabled")
+    return replica_stats()
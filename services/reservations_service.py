@@ -1,6 +1,7 @@
 from fastapi import HTTPException
 from datetime import date
 from models import ReservationCreate
+from services.heavy_reads import run_heavy_read
 from repos.users_repo import find_user_by_id
 from repos.resources_repo import find_resource_by_id, select_rooms
 from repos.reservations_repo import (
@@ -58,15 +59,16 @@ def create_reservation(payload: ReservationCreate):
     if room["type"] != "room":
         raise HTTPException(status_code=400, detail="Resource is not a room")
 
-    if not is_available(payload.resource_id, payload.start_date, payload.end_date):
-        raise HTTPException(status_code=409, detail="Room not available in that date interval")
-
-    return insert_reservation(
+    created = insert_reservation(
         user_id=payload.user_id,
         resource_id=payload.resource_id,
         start_date=payload.start_date,
-        end_date=payload.end_date
+        end_date=payload.end_date,
+        conflicts=lambda r: overlaps_dates(payload.start_date, payload.end_date, r["start_date"], r["end_date"])
     )
+    if created is None:
+        raise HTTPException(status_code=409, detail="Room not available in that date interval")
+    return created
 
 
 def cancel_reservation(reservation_id: int, actor_user_id: int):
@@ -85,7 +87,8 @@ def cancel_reservation(reservation_id: int, actor_user_id: int):
     if actor_user_id != r["user_id"] and not is_admin:
         raise HTTPException(status_code=403, detail="Not allowed")
 
-    cancel_reservation_by_id(reservation_id)
+    if not cancel_reservation_by_id(reservation_id):
+        raise HTTPException(status_code=409, detail="Reservation is not ACTIVE")
     return get_reservation_by_id(reservation_id)
 
 
@@ -96,8 +99,15 @@ def my_reservations(user_id: int, include_cancelled: bool):
     return list_reservations_by_user(user_id, include_cancelled)
 
 
-def availability(start_date: str, end_date: str, min_capacity: int | None):
+async def availability(start_date: str, end_date: str, min_capacity: int | None):
     ensure_interval(start_date, end_date)
+    return await run_heavy_read(
+        ("availability", start_date, end_date, min_capacity),
+        lambda: _compute_availability(start_date, end_date, min_capacity)
+    )
+
+
+def _compute_availability(start_date: str, end_date: str, min_capacity: int | None):
     rooms = select_rooms(min_capacity=min_capacity)
 
     available = []
@@ -108,9 +118,12 @@ def availability(start_date: str, end_date: str, min_capacity: int | None):
     return {"start_date": start_date, "end_date": end_date, "available": available}
 
 
-def occupancy_report(day: str):
-    parse_date(day)  
+async def occupancy_report(day: str):
+    parse_date(day)
+    return await run_heavy_read(("occupancy", day), lambda: _compute_occupancy(day))
+
 
+def _compute_occupancy(day: str):
     total_rooms = count_total_rooms()
     if total_rooms == 0:
         return {"day": day, "rooms": 0, "reserved_rooms": 0, "occupancy_ratio": 0.0}
@@ -1,6 +1,6 @@
 from fastapi import HTTPException
 from models import UserCreate
-from repos.users_repo import find_user_all, insert_user, find_user_by_username
+from repos.users_repo import find_user_all, insert_user, find_user_by_username, find_user_by_id
 
 
 def create_user(payload: UserCreate):
@@ -21,4 +21,13 @@ def get_user_all():
     rows = find_user_all()
     if not rows:
         raise HTTPException(status_code=404, detail="Users not found")
-    return rows
\ No newline at end of file
+    return rows
+
+
+def ensure_admin(admin_user_id: int):
+    admin = find_user_by_id(admin_user_id)
+    if not admin:
+        raise HTTPException(status_code=404, detail="Admin user not found")
+    if int(admin["is_admin"]) != 1:
+        raise HTTPException(status_code=403, detail="Not an admin")
+    return admin